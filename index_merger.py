@@ -0,0 +1,214 @@
+# index_merger.py
+import os
+import json
+import logging
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional
+
+from llama_index.core import StorageContext
+from llama_index.core.data_structs.data_structs import IndexDict
+
+from config import Config
+from partitioning import MANIFEST_FILENAME, PARTITION_DIR_PATTERN, check_manifests
+
+# Logging konfigurieren
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+class IndexMerger:
+    """
+    Klasse zum Zusammenführen von Teil-Indizes, die mit `main.py index --partition` erstellt wurden.
+    """
+
+    def __init__(self, config: Config = None):
+        """
+        Initialisiert den Index-Merger.
+
+        Args:
+            config: Konfigurationsobjekt (optional)
+        """
+        self.config = config or Config.initialize()
+
+    def find_partition_dirs(self, partitions_dir: Optional[str] = None,
+                            build_id: Optional[str] = None) -> List[str]:
+        """
+        Findet alle Teil-Index-Verzeichnisse ("part-<i>-of-<N>") mit Manifest.
+
+        Args:
+            partitions_dir: Verzeichnis mit den Teil-Indizes (optional)
+            build_id: Nur Teil-Indizes dieses Builds berücksichtigen (optional)
+
+        Returns:
+            Sortierte Liste der Teil-Index-Verzeichnisse
+
+        Raises:
+            ValueError: Wenn Teil-Indizes mit unterschiedlicher Partitionsanzahl gefunden werden
+        """
+        search_dir = partitions_dir or os.path.join(self.config.INDEX_DIR, "partitions")
+
+        if not os.path.isdir(search_dir):
+            logger.warning(f"Partitionsverzeichnis existiert nicht: {search_dir}")
+            return []
+
+        partition_dirs = {}
+        for name in sorted(os.listdir(search_dir)):
+            match = PARTITION_DIR_PATTERN.match(name)
+            directory = os.path.join(search_dir, name)
+            if not match or not os.path.isfile(os.path.join(directory, MANIFEST_FILENAME)):
+                continue
+
+            if build_id is not None and self.load_manifest(directory).get("build_id") != build_id:
+                logger.info(f"Überspringe Teil-Index aus anderem Build: {directory}")
+                continue
+
+            partition_dirs[directory] = int(match.group(2))
+
+        partition_counts = sorted(set(partition_dirs.values()))
+        if len(partition_counts) > 1:
+            raise ValueError(f"In {search_dir} liegen Teil-Indizes mit unterschiedlicher Partitionsanzahl "
+                             f"{partition_counts}. Veraltete Teil-Indizes entfernen oder --build_id angeben.")
+
+        return list(partition_dirs)
+
+    def load_manifest(self, directory: str) -> Dict[str, Any]:
+        """
+        Lädt das Manifest eines Teil-Index.
+
+        Args:
+            directory: Verzeichnis des Teil-Index
+
+        Returns:
+            Inhalt des Manifests
+        """
+        manifest_path = os.path.join(directory, MANIFEST_FILENAME)
+        if not os.path.isfile(manifest_path):
+            raise ValueError(f"Kein Manifest gefunden in: {directory}")
+
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def merge(self, partition_dirs: List[str], output_dir: Optional[str] = None,
+              allow_incomplete: bool = False) -> str:
+        """
+        Führt Docstores, Vektorspeicher und Manifeste mehrerer Teil-Indizes zu einem Index zusammen.
+
+        Args:
+            partition_dirs: Verzeichnisse der Teil-Indizes
+            output_dir: Zielverzeichnis (optional, verwendet sonst das konfigurierte Verzeichnis)
+            allow_incomplete: Auch zusammenführen, wenn nicht alle Partitionen vorhanden sind
+
+        Returns:
+            Pfad zum zusammengeführten Index
+
+        Raises:
+            ValueError: Wenn die Teil-Indizes nicht zusammenpassen oder IDs kollidieren
+        """
+        if not partition_dirs:
+            raise ValueError("Keine Teil-Indizes zum Zusammenführen angegeben")
+
+        manifests = {directory: self.load_manifest(directory) for directory in partition_dirs}
+        check_manifests(manifests, self.config.EMBEDDING_MODEL, allow_incomplete)
+
+        merged_context = StorageContext.from_defaults()
+        merged_docstore = merged_context.docstore
+        merged_vector_data = merged_context.vector_store.data
+        merged_struct = IndexDict()
+        embedding_dim = None
+
+        for directory, manifest in manifests.items():
+            if not manifest.get("files"):
+                logger.info(f"Überspringe leeren Teil-Index: {directory}")
+                continue
+
+            storage_context = StorageContext.from_defaults(persist_dir=directory)
+
+            # Docstore: Knoten und Dokument-Hashes übernehmen
+            nodes = list(storage_context.docstore.docs.values())
+            if manifest.get("node_count") != len(nodes):
+                raise ValueError(f"Teil-Index {directory} ist unvollständig: Manifest nennt "
+                                 f"{manifest.get('node_count')} Knoten, Docstore enthält {len(nodes)}")
+            colliding = [node.node_id for node in nodes if merged_docstore.document_exists(node.node_id)]
+            if colliding:
+                raise ValueError(f"{len(colliding)} Knoten-IDs aus {directory} existieren bereits, "
+                                 f"z.B. {colliding[0]}")
+            merged_docstore.add_documents(nodes, allow_update=False)
+            for doc_hash, doc_id in storage_context.docstore.get_all_document_hashes().items():
+                merged_docstore.set_document_hash(doc_id, doc_hash)
+
+            # Vektorspeicher: Embeddings samt Zuordnungen übernehmen
+            vector_data = storage_context.vector_store.data
+            colliding = vector_data.embedding_dict.keys() & merged_vector_data.embedding_dict.keys()
+            if colliding:
+                raise ValueError(f"{len(colliding)} Embedding-IDs aus {directory} existieren bereits, "
+                                 f"z.B. {next(iter(colliding))}")
+
+            for embedding in vector_data.embedding_dict.values():
+                if embedding_dim is None:
+                    embedding_dim = len(embedding)
+                elif len(embedding) != embedding_dim:
+                    raise ValueError(f"Embedding-Dimension in {directory} ({len(embedding)}) "
+                                     f"passt nicht zu den übrigen Teil-Indizes ({embedding_dim})")
+                break
+
+            merged_vector_data.embedding_dict.update(vector_data.embedding_dict)
+            merged_vector_data.text_id_to_ref_doc_id.update(vector_data.text_id_to_ref_doc_id)
+            if vector_data.metadata_dict:
+                if merged_vector_data.metadata_dict is None:
+                    merged_vector_data.metadata_dict = {}
+                merged_vector_data.metadata_dict.update(vector_data.metadata_dict)
+
+            # Index-Struktur: Knoten-Zuordnungen übernehmen
+            for index_struct in storage_context.index_store.index_structs():
+                if isinstance(index_struct, IndexDict):
+                    merged_struct.nodes_dict.update(index_struct.nodes_dict)
+
+            logger.info(f"Teil-Index übernommen: {directory} ({len(nodes)} Knoten)")
+
+        merged_context.index_store.add_index_struct(merged_struct)
+
+        save_dir = output_dir or self.config.INDEX_DIR
+        # Altes Manifest zuerst entfernen, damit ein abgebrochener Lauf nicht als vollständig gilt
+        manifest_path = os.path.join(save_dir, MANIFEST_FILENAME)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+        merged_context.persist(save_dir)
+        self.write_manifest(save_dir, manifests, len(merged_docstore.docs))
+        logger.info(f"Zusammengeführter Index gespeichert in: {save_dir}")
+        return save_dir
+
+    def write_manifest(self, directory: str, manifests: Dict[str, Dict[str, Any]], node_count: int) -> str:
+        """
+        Schreibt das Manifest des zusammengeführten Index.
+
+        Args:
+            directory: Verzeichnis des zusammengeführten Index
+            manifests: Manifeste der Teil-Indizes
+            node_count: Anzahl der Knoten im zusammengeführten Docstore
+
+        Returns:
+            Pfad zur Manifest-Datei
+        """
+        first_manifest = next(iter(manifests.values()))
+        manifest = {
+            "embedding_model": first_manifest.get("embedding_model"),
+            "chunk_size": first_manifest.get("chunk_size"),
+            "chunk_overlap": first_manifest.get("chunk_overlap"),
+            "partition": None,
+            "files": sorted(pdf_key for part in manifests.values() for pdf_key in part.get("files", [])),
+            "failed_files": sorted(pdf_key for part in manifests.values()
+                                   for pdf_key in part.get("failed_files", [])),
+            "node_count": node_count,
+            "build_id": first_manifest.get("build_id"),
+            "merged_from": [
+                {"directory": part_dir, "partition": part.get("partition")}
+                for part_dir, part in manifests.items()
+            ],
+            "created_at": datetime.now(timezone.utc).isoformat()
+        }
+
+        manifest_path = os.path.join(directory, MANIFEST_FILENAME)
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        return manifest_path
@@ -9,6 +9,8 @@ from pathlib import Path
 from config import Config
 from pdf_processor import PDFProcessor
 from query_engine import QueryEngine
+from index_merger import IndexMerger
+from partitioning import parse_partition, partition_dir_name
 import sys
 import traceback
 
@@ -49,6 +51,45 @@ def setup_argparse():
         nargs="+",
         help="Spezifische PDF-Dateien, die indiziert werden sollen"
     )
+    index_parser.add_argument(
+        "--partition",
+        type=parse_partition,
+        help="Nur Partition i von N indizieren (Format i/N, i beginnt bei 0) und als Teil-Index "
+             "unter <index_dir>/partitions/part-<i>-of-<N> speichern"
+    )
+    index_parser.add_argument(
+        "--partition_dir",
+        help="Abweichendes Zielverzeichnis für den Teil-Index (nur mit --partition)"
+    )
+    index_parser.add_argument(
+        "--build_id",
+        help="Kennung des verteilten Builds, wird im Manifest des Teil-Index gespeichert (nur mit --partition)"
+    )
+
+    # Zusammenführen von Teil-Indizes
+    merge_parser = subparsers.add_parser("merge-index", help="Teil-Indizes zu einem Index zusammenführen")
+    merge_parser.add_argument(
+        "partition_dirs",
+        nargs="*",
+        help="Verzeichnisse der Teil-Indizes (Standard: alle Teil-Indizes unter <partitions_dir>)"
+    )
+    merge_parser.add_argument(
+        "--index_dir",
+        help="Verzeichnis zum Speichern des zusammengeführten Index (überschreibt Konfiguration)"
+    )
+    merge_parser.add_argument(
+        "--partitions_dir",
+        help="Verzeichnis, in dem nach Teil-Indizes gesucht wird (Standard: <index_dir>/partitions)"
+    )
+    merge_parser.add_argument(
+        "--build_id",
+        help="Nur Teil-Indizes mit dieser Build-Kennung zusammenführen"
+    )
+    merge_parser.add_argument(
+        "--allow-incomplete",
+        action="store_true",
+        help="Auch zusammenführen, wenn nicht alle Partitionen vorhanden sind"
+    )
 
     # Abfrage-Befehl
     query_parser = subparsers.add_parser("query", help="Indizierten PDFs abfragen")
@@ -92,6 +133,12 @@ def main():
 
         # Indexierungsbefehl
         if args.command == "index":
+            if args.partition_dir and not args.partition:
+                parser.error("--partition_dir kann nur zusammen mit --partition verwendet werden")
+
+            if args.build_id and not args.partition:
+                parser.error("--build_id kann nur zusammen mit --partition verwendet werden")
+
             logger.info("Starte Indexierungsprozess...")
 
             # PDF-Verzeichnis überschreiben, falls angegeben
@@ -113,13 +160,33 @@ def main():
                     return
 
                 logger.info(f"Verarbeite {len(pdf_files)} spezifische PDF-Dateien...")
-                processor.process_pdfs(pdf_files)
+                processor.process_pdfs(pdf_files, partition=args.partition, build_id=args.build_id)
             else:
-                processor.process_pdfs()
-
-            processor.save_index()
+                processor.process_pdfs(partition=args.partition, build_id=args.build_id)
+
+            if args.partition:
+                # Teil-Index in eigenem Unterverzeichnis speichern, damit sich die Worker nicht überschreiben
+                save_dir = args.partition_dir or os.path.join(
+                    config.INDEX_DIR, "partitions", partition_dir_name(args.partition)
+                )
+                processor.save_index(save_dir)
+            else:
+                processor.save_index()
             logger.info("Indexierung abgeschlossen.")
 
+        # Befehl zum Zusammenführen von Teil-Indizes
+        elif args.command == "merge-index":
+            # Index-Verzeichnis überschreiben, falls angegeben (vor der Suche nach Teil-Indizes)
+            if args.index_dir:
+                config.INDEX_DIR = args.index_dir
+
+            merger = IndexMerger(config)
+            partition_dirs = args.partition_dirs or merger.find_partition_dirs(args.partitions_dir, args.build_id)
+
+            logger.info(f"Führe {len(partition_dirs)} Teil-Indizes zusammen...")
+            merger.merge(partition_dirs, allow_incomplete=args.allow_incomplete)
+            logger.info("Zusammenführung abgeschlossen.")
+
         # Abfragebefehl
         elif args.command == "query":
             # Index-Verzeichnis überschreiben, falls angegeben
@@ -0,0 +1,177 @@
+# partitioning.py
+import argparse
+import hashlib
+import logging
+import re
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+# Logging konfigurieren
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Dateiname des Manifests, das neben den Index-Dateien gespeichert wird
+MANIFEST_FILENAME = "manifest.json"
+
+# Namensschema der Teil-Index-Verzeichnisse unter <index_dir>/partitions
+PARTITION_DIR_PATTERN = re.compile(r"^part-(\d+)-of-(\d+)$")
+
+
+def partition_dir_name(partition: Tuple[int, int]) -> str:
+    """
+    Liefert den Verzeichnisnamen eines Teil-Index.
+
+    Args:
+        partition: Tupel (Index, Anzahl) der Partition
+
+    Returns:
+        Verzeichnisname im Format "part-<i>-of-<N>"
+    """
+    return f"part-{partition[0]}-of-{partition[1]}"
+
+
+def parse_partition(value: str) -> Tuple[int, int]:
+    """
+    Liest eine Partitionsangabe im Format "i/N" ein.
+
+    Args:
+        value: Partitionsangabe, z.B. "0/4"
+
+    Returns:
+        Tupel (Index, Anzahl)
+    """
+    try:
+        partition_index, partition_count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Ungültige Partition '{value}', erwartet wird das Format i/N")
+
+    if partition_count < 1:
+        raise argparse.ArgumentTypeError(f"Ungültige Partition '{value}', N muss mindestens 1 sein")
+
+    if not 0 <= partition_index < partition_count:
+        raise argparse.ArgumentTypeError(
+            f"Ungültige Partition '{value}', i muss zwischen 0 und {partition_count - 1} liegen"
+        )
+
+    return partition_index, partition_count
+
+
+def get_pdf_key(pdf_file: str, pdf_dir: str) -> str:
+    """
+    Ermittelt einen maschinenunabhängigen Schlüssel für eine PDF-Datei.
+
+    Args:
+        pdf_file: Pfad zur PDF-Datei
+        pdf_dir: Konfiguriertes PDF-Verzeichnis
+
+    Returns:
+        Pfad relativ zum PDF-Verzeichnis (mit "/" als Trenner) oder der absolute Pfad,
+        falls die Datei außerhalb des PDF-Verzeichnisses liegt
+    """
+    pdf_path = Path(pdf_file).absolute()
+    try:
+        return pdf_path.relative_to(Path(pdf_dir).absolute()).as_posix()
+    except ValueError:
+        return pdf_path.as_posix()
+
+
+def partition_pdf_files(pdf_files: List[str], pdf_dir: str, partition: Tuple[int, int]) -> List[str]:
+    """
+    Wählt die PDF-Dateien aus, die zu einer Partition gehören.
+
+    Die Zuordnung basiert auf einem Hash des Dateischlüssels und ist damit auf allen
+    Rechnern gleich, unabhängig von der Reihenfolge der Dateien.
+
+    Args:
+        pdf_files: Liste aller PDF-Dateien
+        pdf_dir: Konfiguriertes PDF-Verzeichnis
+        partition: Tupel (Index, Anzahl) der Partition, Index beginnt bei 0
+
+    Returns:
+        Liste der PDF-Dateien dieser Partition
+    """
+    partition_index, partition_count = partition
+    selected = []
+    for pdf_file in pdf_files:
+        digest = hashlib.sha1(get_pdf_key(pdf_file, pdf_dir).encode("utf-8")).hexdigest()
+        if int(digest, 16) % partition_count == partition_index:
+            selected.append(pdf_file)
+
+    logger.info(f"Partition {partition_index}/{partition_count}: "
+                f"{len(selected)} von {len(pdf_files)} PDF-Dateien zugeordnet")
+    return selected
+
+
+def check_manifests(manifests: Dict[str, Dict[str, Any]],
+                    embedding_model: Optional[str] = None,
+                    allow_incomplete: bool = False) -> None:
+    """
+    Prüft, ob die Teil-Indizes zueinander passen.
+
+    Args:
+        manifests: Zuordnung Verzeichnis -> Manifest
+        embedding_model: Konfiguriertes Embedding-Modell für Abfragen (optional, nur Warnung)
+        allow_incomplete: Fehlende Partitionen nur melden statt abzubrechen
+
+    Raises:
+        ValueError: Bei unterschiedlichen Embedding-Modellen oder Build-IDs, doppelten oder fehlenden
+            Partitionen oder PDFs, die in mehreren Teil-Indizes enthalten sind
+    """
+    build_ids = {manifest.get("build_id") for manifest in manifests.values()}
+    if len(build_ids) > 1:
+        details = ", ".join(f"{directory}: {manifest.get('build_id')}"
+                            for directory, manifest in manifests.items())
+        raise ValueError(f"Teil-Indizes stammen aus unterschiedlichen Builds ({details})")
+
+    embedding_models = {manifest.get("embedding_model") for manifest in manifests.values()}
+    if len(embedding_models) > 1:
+        details = ", ".join(f"{directory}: {manifest.get('embedding_model')}"
+                            for directory, manifest in manifests.items())
+        raise ValueError(f"Teil-Indizes verwenden unterschiedliche Embedding-Modelle ({details})")
+
+    partitions_model = next(iter(embedding_models), None)
+    if embedding_model and partitions_model != embedding_model:
+        logger.warning(f"Teil-Indizes wurden mit '{partitions_model}' erstellt, konfiguriert ist aber "
+                       f"'{embedding_model}'. Abfragen müssen dasselbe Modell verwenden.")
+
+    chunk_settings = {(manifest.get("chunk_size"), manifest.get("chunk_overlap"))
+                      for manifest in manifests.values()}
+    if len(chunk_settings) > 1:
+        logger.warning(f"Teil-Indizes verwenden unterschiedliche Chunk-Einstellungen: {sorted(chunk_settings)}")
+
+    seen_partitions = {}
+    partition_counts = set()
+    for directory, manifest in manifests.items():
+        partition = manifest.get("partition")
+        if partition is None:
+            continue
+
+        partition_counts.add(partition["count"])
+        if partition["index"] in seen_partitions:
+            raise ValueError(f"Partition {partition['index']} ist doppelt vorhanden: "
+                             f"{seen_partitions[partition['index']]} und {directory}")
+        seen_partitions[partition["index"]] = directory
+
+    if len(partition_counts) > 1:
+        raise ValueError(f"Teil-Indizes wurden mit unterschiedlicher Partitionsanzahl erstellt: "
+                         f"{sorted(partition_counts)}")
+
+    if partition_counts:
+        partition_count = partition_counts.pop()
+        missing = sorted(set(range(partition_count)) - set(seen_partitions))
+        if missing:
+            if not allow_incomplete:
+                raise ValueError(f"Fehlende Partitionen (von {partition_count}): {missing}. "
+                                 f"Mit --allow-incomplete trotzdem zusammenführen.")
+            logger.warning(f"Fehlende Partitionen (von {partition_count}): {missing}")
+
+    seen_files = {}
+    for directory, manifest in manifests.items():
+        for pdf_key in manifest.get("files", []):
+            if seen_files.get(pdf_key, directory) != directory:
+                raise ValueError(f"PDF '{pdf_key}' ist in mehreren Teil-Indizes enthalten: "
+                                 f"{seen_files[pdf_key]} und {directory}")
+            seen_files[pdf_key] = directory
+
+        for pdf_key in manifest.get("failed_files", []):
+            logger.warning(f"PDF '{pdf_key}' konnte in {directory} nicht geladen werden und fehlt im Index")
@@ -1,7 +1,9 @@
 # pdf_processor.py
 import os
 import glob
-from typing import List, Optional, Dict, Any
+import json
+from datetime import datetime, timezone
+from typing import List, Optional, Dict, Any, Tuple
 from pathlib import Path
 import logging
 
@@ -14,6 +16,7 @@ from llama_index.llms.openai import OpenAI
 from llama_index.llms.anthropic import Anthropic
 
 from config import Config
+from partitioning import MANIFEST_FILENAME, get_pdf_key, partition_pdf_files
 
 # Logging konfigurieren
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -34,6 +37,10 @@ class PDFProcessor:
         """
         self.config = config or Config.initialize()
         self.index = None
+        self.pdf_files: List[str] = []
+        self.failed_files: List[str] = []
+        self.partition: Optional[Tuple[int, int]] = None
+        self.build_id: Optional[str] = None
         self._setup_llama_index()
 
     def _setup_llama_index(self):
@@ -85,7 +92,8 @@ class PDFProcessor:
             return []
 
         pdf_pattern = os.path.join(self.config.PDF_DIR, "**/*.pdf")
-        pdf_files = glob.glob(pdf_pattern, recursive=True)
+        # Sortieren, damit alle Worker dieselbe Reihenfolge sehen (wichtig für MAX_PDFS und Partitionen)
+        pdf_files = sorted(glob.glob(pdf_pattern, recursive=True))
 
         # Optional: Begrenze die Anzahl der PDFs
         if self.config.MAX_PDFS > 0:
@@ -94,12 +102,16 @@ class PDFProcessor:
         logger.info(f"{len(pdf_files)} PDF-Dateien gefunden in {self.config.PDF_DIR}")
         return pdf_files
 
-    def process_pdfs(self, pdf_files: Optional[List[str]] = None) -> VectorStoreIndex | None:
+    def process_pdfs(self, pdf_files: Optional[List[str]] = None,
+                     partition: Optional[Tuple[int, int]] = None,
+                     build_id: Optional[str] = None) -> VectorStoreIndex | None:
         """
         Verarbeitet die angegebenen PDF-Dateien und erstellt einen Index.
 
         Args:
             pdf_files: Liste der zu verarbeitenden PDF-Dateien (optional)
+            partition: Tupel (Index, Anzahl), um nur einen Teil der PDFs zu verarbeiten (optional)
+            build_id: Kennung des verteilten Builds, wird ins Manifest übernommen (optional)
 
         Returns:
             Der erstellte VectorStoreIndex
@@ -107,6 +119,16 @@ class PDFProcessor:
         if pdf_files is None:
             pdf_files = self.get_pdf_files()
 
+        if partition is not None:
+            pdf_files = partition_pdf_files(pdf_files, self.config.PDF_DIR, partition)
+
+        # Erfolgreich geladene und fehlgeschlagene PDFs getrennt für das Manifest festhalten
+        self.index = None
+        self.pdf_files = []
+        self.failed_files = []
+        self.partition = partition
+        self.build_id = build_id
+
         if not pdf_files:
             logger.warning("Keine PDF-Dateien zum Verarbeiten gefunden!")
             return None
@@ -126,8 +148,10 @@ class PDFProcessor:
                     pdf_path = Path(pdf_file)
                     doc = pdf_reader.load_data(file=pdf_path)
                     documents.extend(doc)
+                    self.pdf_files.append(pdf_file)
                     logger.info(f"PDF geladen: {pdf_file}")
                 except Exception as e:
+                    self.failed_files.append(pdf_file)
                     logger.error(f"Fehler beim Laden von {pdf_file}: {str(e)}")
         except Exception as e:
             logger.error(f"Fehler beim Laden der PDFs: {str(e)}")
@@ -250,15 +274,61 @@ class PDFProcessor:
         Returns:
             Pfad zum gespeicherten Index
         """
+        save_dir = directory or self.config.INDEX_DIR
+
+        # Altes Manifest zuerst entfernen: Bricht persist() ab, gilt das Verzeichnis nicht als fertig
+        manifest_path = os.path.join(save_dir, MANIFEST_FILENAME)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+
         if self.index is None:
+            if self.partition is not None and not self.pdf_files:
+                # Leere Partition: nur das Manifest schreiben, damit merge-index sie als erledigt erkennt
+                os.makedirs(save_dir, exist_ok=True)
+                self.write_manifest(save_dir)
+                logger.info(f"Leere Partition, nur Manifest gespeichert in: {save_dir}")
+                return save_dir
+
             logger.error("Kein Index zum Speichern vorhanden!")
             return None
 
-        save_dir = directory or self.config.INDEX_DIR
         self.index.storage_context.persist(save_dir)
+        self.write_manifest(save_dir)
         logger.info(f"Index gespeichert in: {save_dir}")
         return save_dir
 
+    def write_manifest(self, directory: str) -> str:
+        """
+        Schreibt das Manifest mit den Build-Einstellungen und den enthaltenen PDFs.
+
+        Args:
+            directory: Verzeichnis des Index
+
+        Returns:
+            Pfad zur Manifest-Datei
+        """
+        node_count = len(self.index.docstore.docs) if self.index is not None else 0
+        manifest = {
+            "embedding_model": self.config.EMBEDDING_MODEL,
+            "chunk_size": self.config.CHUNK_SIZE,
+            "chunk_overlap": self.config.CHUNK_OVERLAP,
+            "partition": {
+                "index": self.partition[0],
+                "count": self.partition[1]
+            } if self.partition is not None else None,
+            "build_id": self.build_id,
+            "files": [get_pdf_key(pdf_file, self.config.PDF_DIR) for pdf_file in self.pdf_files],
+            "failed_files": [get_pdf_key(pdf_file, self.config.PDF_DIR) for pdf_file in self.failed_files],
+            "node_count": node_count,
+            "created_at": datetime.now(timezone.utc).isoformat()
+        }
+
+        manifest_path = os.path.join(directory, MANIFEST_FILENAME)
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        return manifest_path
+
     def load_index(self, directory: Optional[str] = None) -> BaseIndex | None:
         """
         Lädt einen gespeicherten Index.
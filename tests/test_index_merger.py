@@ -0,0 +1,131 @@
+# tests/test_index_merger.py
+import json
+import os
+import shutil
+
+import pytest
+
+pytest.importorskip("llama_index.core")
+
+from llama_index.core import Document, MockEmbedding, Settings, StorageContext, VectorStoreIndex, \
+    load_index_from_storage
+
+from index_merger import IndexMerger
+from partitioning import MANIFEST_FILENAME, partition_dir_name
+
+EMBEDDING_MODEL = "mock-embedding"
+
+
+class MergeConfig:
+    EMBEDDING_MODEL = EMBEDDING_MODEL
+
+    def __init__(self, index_dir):
+        self.INDEX_DIR = index_dir
+
+
+@pytest.fixture(autouse=True)
+def mock_embedding():
+    previous = Settings._embed_model
+    Settings.embed_model = MockEmbedding(embed_dim=8)
+    yield
+    Settings._embed_model = previous
+
+
+def build_partition(directory, texts, partition=None, build_id=None):
+    documents = [Document(text=text, metadata={"filename": f"{text}.pdf"}) for text in texts]
+    index = VectorStoreIndex.from_documents(documents)
+    index.storage_context.persist(directory)
+
+    manifest = {
+        "embedding_model": EMBEDDING_MODEL,
+        "chunk_size": 512,
+        "chunk_overlap": 50,
+        "partition": {"index": partition[0], "count": partition[1]} if partition else None,
+        "build_id": build_id,
+        "files": [f"{text}.pdf" for text in texts],
+        "failed_files": [],
+        "node_count": len(index.docstore.docs)
+    }
+    with open(os.path.join(directory, MANIFEST_FILENAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+    return directory
+
+
+def update_manifest(directory, **changes):
+    manifest_path = os.path.join(directory, MANIFEST_FILENAME)
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    manifest.update(changes)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+
+def test_merge_combines_partitions(tmp_path):
+    partitions_dir = tmp_path / "index" / "partitions"
+    build_partition(str(partitions_dir / partition_dir_name((0, 2))), ["alpha", "beta"], (0, 2))
+    build_partition(str(partitions_dir / partition_dir_name((1, 2))), ["gamma"], (1, 2))
+
+    merger = IndexMerger(MergeConfig(str(tmp_path / "index")))
+    partition_dirs = merger.find_partition_dirs()
+    save_dir = merger.merge(partition_dirs)
+
+    index = load_index_from_storage(StorageContext.from_defaults(persist_dir=save_dir))
+    assert len(index.docstore.docs) == 3
+    assert len(index.vector_store.data.embedding_dict) == 3
+    assert len(index.index_struct.nodes_dict) == 3
+
+    with open(os.path.join(save_dir, MANIFEST_FILENAME), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    assert manifest["files"] == ["alpha.pdf", "beta.pdf", "gamma.pdf"]
+    assert manifest["node_count"] == 3
+
+    retrieved = index.as_retriever(similarity_top_k=3).retrieve("alpha")
+    assert {node.node.metadata["filename"] for node in retrieved} == {"alpha.pdf", "beta.pdf", "gamma.pdf"}
+
+
+def test_merge_rejects_colliding_node_ids(tmp_path):
+    first = build_partition(str(tmp_path / "first"), ["alpha"])
+    second = str(tmp_path / "second")
+    shutil.copytree(first, second)
+    update_manifest(second, files=["beta.pdf"])
+
+    merger = IndexMerger(MergeConfig(str(tmp_path / "index")))
+    with pytest.raises(ValueError, match="Knoten-IDs"):
+        merger.merge([first, second])
+
+
+def test_merge_rejects_node_count_mismatch(tmp_path):
+    partition_dir = build_partition(str(tmp_path / partition_dir_name((0, 1))), ["alpha"], (0, 1))
+    update_manifest(partition_dir, node_count=5)
+
+    merger = IndexMerger(MergeConfig(str(tmp_path / "index")))
+    with pytest.raises(ValueError, match="unvollständig"):
+        merger.merge([partition_dir])
+
+
+def test_find_partition_dirs_rejects_mixed_partition_counts(tmp_path):
+    partitions_dir = tmp_path / "index" / "partitions"
+    build_partition(str(partitions_dir / partition_dir_name((0, 1))), ["alpha"], (0, 1), build_id="old")
+    build_partition(str(partitions_dir / partition_dir_name((0, 2))), ["beta"], (0, 2), build_id="new")
+    build_partition(str(partitions_dir / partition_dir_name((1, 2))), ["gamma"], (1, 2), build_id="new")
+    os.makedirs(partitions_dir / "unrelated")
+
+    merger = IndexMerger(MergeConfig(str(tmp_path / "index")))
+    with pytest.raises(ValueError, match="unterschiedlicher Partitionsanzahl"):
+        merger.find_partition_dirs()
+
+    assert merger.find_partition_dirs(build_id="new") == [
+        str(partitions_dir / partition_dir_name((0, 2))),
+        str(partitions_dir / partition_dir_name((1, 2)))
+    ]
+
+
+def test_find_partition_dirs_skips_stale_partition_of_other_build(tmp_path):
+    partitions_dir = tmp_path / "index" / "partitions"
+    build_partition(str(partitions_dir / partition_dir_name((0, 2))), ["alpha"], (0, 2), build_id="new")
+    build_partition(str(partitions_dir / partition_dir_name((1, 2))), ["beta"], (1, 2), build_id="old")
+
+    merger = IndexMerger(MergeConfig(str(tmp_path / "index")))
+    with pytest.raises(ValueError, match="Fehlende Partitionen"):
+        merger.merge(merger.find_partition_dirs(build_id="new"))
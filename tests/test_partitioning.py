@@ -0,0 +1,131 @@
+# tests/test_partitioning.py
+import argparse
+import os
+
+import pytest
+
+from partitioning import check_manifests, get_pdf_key, parse_partition, partition_pdf_files
+
+
+def make_manifest(index, count, files, embedding_model="intfloat/multilingual-e5-large"):
+    return {
+        "embedding_model": embedding_model,
+        "chunk_size": 512,
+        "chunk_overlap": 50,
+        "partition": {"index": index, "count": count},
+        "files": files
+    }
+
+
+def test_parse_partition_valid():
+    assert parse_partition("0/4") == (0, 4)
+    assert parse_partition("3/4") == (3, 4)
+    assert parse_partition("0/1") == (0, 1)
+
+
+@pytest.mark.parametrize("value, message", [
+    ("1/0", "N muss mindestens 1 sein"),
+    ("0/-2", "N muss mindestens 1 sein"),
+    ("4/4", "zwischen 0 und 3"),
+    ("-1/4", "zwischen 0 und 3"),
+    ("1", "Format i/N"),
+    ("a/4", "Format i/N"),
+    ("1/2/3", "Format i/N"),
+])
+def test_parse_partition_invalid(value, message):
+    with pytest.raises(argparse.ArgumentTypeError, match=message):
+        parse_partition(value)
+
+
+@pytest.mark.parametrize("partition_count", [1, 2, 3, 7])
+def test_partition_pdf_files_disjoint_and_complete(tmp_path, partition_count):
+    pdf_dir = str(tmp_path)
+    pdf_files = [os.path.join(pdf_dir, "sub" if i % 3 else "", f"doc{i}.pdf") for i in range(50)]
+
+    partitions = [partition_pdf_files(pdf_files, pdf_dir, (i, partition_count))
+                  for i in range(partition_count)]
+
+    assigned = [pdf_file for partition in partitions for pdf_file in partition]
+    assert sorted(assigned) == sorted(pdf_files)
+    assert len(assigned) == len(set(assigned))
+
+
+def test_partition_pdf_files_independent_of_order_and_location(tmp_path):
+    pdf_files = [os.path.join(str(tmp_path / "a"), f"doc{i}.pdf") for i in range(20)]
+    moved_files = [os.path.join(str(tmp_path / "b"), f"doc{i}.pdf") for i in range(20)]
+
+    selected = partition_pdf_files(pdf_files, str(tmp_path / "a"), (1, 3))
+    selected_reversed = partition_pdf_files(list(reversed(pdf_files)), str(tmp_path / "a"), (1, 3))
+    selected_moved = partition_pdf_files(moved_files, str(tmp_path / "b"), (1, 3))
+
+    assert sorted(selected) == sorted(selected_reversed)
+    assert [os.path.basename(f) for f in sorted(selected)] == [os.path.basename(f) for f in sorted(selected_moved)]
+
+
+def test_check_manifests_accepts_complete_set():
+    check_manifests({
+        "part0": make_manifest(0, 2, ["a.pdf"]),
+        "part1": make_manifest(1, 2, ["b.pdf"])
+    })
+
+
+def test_check_manifests_rejects_embedding_model_mismatch():
+    with pytest.raises(ValueError, match="Embedding-Modelle"):
+        check_manifests({
+            "part0": make_manifest(0, 2, ["a.pdf"]),
+            "part1": make_manifest(1, 2, ["b.pdf"], embedding_model="other-model")
+        })
+
+
+def test_check_manifests_rejects_duplicate_partition():
+    with pytest.raises(ValueError, match="doppelt"):
+        check_manifests({
+            "part0": make_manifest(0, 2, ["a.pdf"]),
+            "part0-copy": make_manifest(0, 2, ["b.pdf"])
+        })
+
+
+def test_check_manifests_rejects_partition_count_mismatch():
+    with pytest.raises(ValueError, match="Partitionsanzahl"):
+        check_manifests({
+            "part0": make_manifest(0, 2, ["a.pdf"]),
+            "part1": make_manifest(1, 3, ["b.pdf"])
+        })
+
+
+def test_check_manifests_rejects_overlapping_files():
+    with pytest.raises(ValueError, match="mehreren Teil-Indizes"):
+        check_manifests({
+            "part0": make_manifest(0, 2, ["a.pdf"]),
+            "part1": make_manifest(1, 2, ["a.pdf"])
+        })
+
+
+def test_check_manifests_rejects_missing_partition():
+    manifests = {"part0": make_manifest(0, 3, ["a.pdf"]), "part2": make_manifest(2, 3, ["c.pdf"])}
+
+    with pytest.raises(ValueError, match=r"Fehlende Partitionen \(von 3\): \[1\]"):
+        check_manifests(manifests)
+
+    check_manifests(manifests, allow_incomplete=True)
+
+
+def test_get_pdf_key_outside_pdf_dir_uses_absolute_path(tmp_path):
+    pdf_dir = str(tmp_path / "pdfs")
+
+    assert get_pdf_key(str(tmp_path / "pdfs" / "sub" / "a.pdf"), pdf_dir) == "sub/a.pdf"
+    assert get_pdf_key(str(tmp_path / "a" / "report.pdf"), pdf_dir) != \
+        get_pdf_key(str(tmp_path / "b" / "report.pdf"), pdf_dir)
+
+
+def test_check_manifests_rejects_different_build_ids():
+    manifests = {"part0": make_manifest(0, 2, ["a.pdf"]), "part1": make_manifest(1, 2, ["b.pdf"])}
+    manifests["part0"]["build_id"] = "old"
+    manifests["part1"]["build_id"] = "new"
+
+    with pytest.raises(ValueError, match="unterschiedlichen Builds"):
+        check_manifests(manifests)
+
+
+def test_check_manifests_allows_repeated_file_within_one_manifest():
+    check_manifests({"part0": make_manifest(0, 1, ["report.pdf", "report.pdf"])})